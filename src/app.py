@@ -8,6 +8,8 @@ for extracurricular activities at Mergington High School.
 from fastapi import FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
+from pydantic import BaseModel
+from typing import Literal
 import os
 from pathlib import Path
 
@@ -25,98 +27,108 @@ activities = {
       "description": "Learn strategies and compete in chess tournaments",
       "schedule": "Fridays, 3:30 PM - 5:00 PM",
       "max_participants": 12,
-      "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+      "participants": {"michael@mergington.edu", "daniel@mergington.edu"}
    },
    "Programming Class": {
       "description": "Learn programming fundamentals and build software projects",
       "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
       "max_participants": 20,
-      "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+      "participants": {"emma@mergington.edu", "sophia@mergington.edu"}
    },
    "Gym Class": {
       "description": "Physical education and sports activities",
       "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
       "max_participants": 30,
-      "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+      "participants": {"john@mergington.edu", "olivia@mergington.edu"}
    },
    "Basketball Team": {
       "description": "Competitive basketball training and games",
       "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
       "max_participants": 15,
-      "participants": []
+      "participants": set()
    },
    "Swimming Club": {
       "description": "Swimming training and water sports",
       "schedule": "Mondays and Wednesdays, 3:30 PM - 5:00 PM",
       "max_participants": 20,
-      "participants": []
+      "participants": set()
    },
    "Art Studio": {
       "description": "Express creativity through painting and drawing",
       "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
       "max_participants": 15,
-      "participants": []
+      "participants": set()
    },
    "Drama Club": {
       "description": "Theater arts and performance training",
       "schedule": "Tuesdays, 4:00 PM - 6:00 PM",
       "max_participants": 25,
-      "participants": []
+      "participants": set()
    },
    "Debate Team": {
       "description": "Learn public speaking and argumentation skills",
       "schedule": "Thursdays, 3:30 PM - 5:00 PM",
       "max_participants": 16,
-      "participants": []
+      "participants": set()
    },
    "Science Club": {
       "description": "Hands-on experiments and scientific exploration",
       "schedule": "Fridays, 3:30 PM - 5:00 PM",
       "max_participants": 20,
-      "participants": []
+      "participants": set()
     },
     # Sports-related activities
     "Soccer Team": {
         "description": "Competitive soccer team training and matches",
         "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
         "max_participants": 18,
-        "participants": ["liam@mergington.edu", "noah@mergington.edu"]
+        "participants": {"liam@mergington.edu", "noah@mergington.edu"}
     },
     "Basketball Club": {
         "description": "Pickup games, drills, and interschool competitions",
         "schedule": "Tuesdays and Thursdays, 4:30 PM - 6:00 PM",
         "max_participants": 15,
-        "participants": ["ava@mergington.edu", "mason@mergington.edu"]
+        "participants": {"ava@mergington.edu", "mason@mergington.edu"}
     },
     # Artistic activities
     "Art Club": {
         "description": "Explore drawing, painting, and mixed media projects",
         "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
         "max_participants": 20,
-        "participants": ["isabella@mergington.edu", "charlotte@mergington.edu"]
+        "participants": {"isabella@mergington.edu", "charlotte@mergington.edu"}
     },
     "Drama Club": {
         "description": "Acting workshops, rehearsals, and stage productions",
         "schedule": "Fridays, 4:00 PM - 6:30 PM",
         "max_participants": 25,
-        "participants": ["ethan@mergington.edu", "mia@mergington.edu"]
+        "participants": {"ethan@mergington.edu", "mia@mergington.edu"}
     },
     # Intellectual activities
     "Math Club": {
         "description": "Problem solving, competitions, and math enrichment",
         "schedule": "Thursdays, 3:30 PM - 4:30 PM",
         "max_participants": 20,
-        "participants": ["oliver@mergington.edu", "sophia.b@mergington.edu"]
+        "participants": {"oliver@mergington.edu", "sophia.b@mergington.edu"}
     },
     "Debate Team": {
         "description": "Public speaking, argumentation practice, and tournaments",
         "schedule": "Tuesdays, 5:00 PM - 6:30 PM",
         "max_participants": 16,
-        "participants": ["lucas@mergington.edu", "grace@mergington.edu"]
+        "participants": {"lucas@mergington.edu", "grace@mergington.edu"}
    }
 }
 
 
+class BatchAction(BaseModel):
+    op: Literal["signup", "remove", "get"]
+    activity: str
+    email: str | None = None
+
+
+class BatchRequest(BaseModel):
+    actions: list[BatchAction]
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
@@ -124,7 +136,11 @@ def root():
 
 @app.get("/activities")
 def get_activities():
-    return activities
+    # Participants are stored as sets; serialize them as sorted lists
+    return {
+        name: {**details, "participants": sorted(details["participants"])}
+        for name, details in activities.items()
+    }
 
 
 @app.post("/activities/{activity_name}/signup")
@@ -150,7 +166,7 @@ def signup_for_activity(activity_name: str, email: str):
         raise HTTPException(status_code=400, detail="Student already signed up for this activity")
 
     # Add student
-    activity["participants"].append(email)
+    activity["participants"].add(email)
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
@@ -171,3 +187,28 @@ def remove_participant_from_activity(activity_name: str, email: str):
     # Remove participant
     activity["participants"].remove(email)
     return {"message": f"Removed {email} from {activity_name}"}
+
+
+@app.post("/activities/batch")
+def batch_activity_actions(batch: BatchRequest):
+    """Apply several signup/remove/get actions in order and report each result"""
+    results = []
+    for action in batch.actions:
+        try:
+            if action.op == "get":
+                if action.activity not in activities:
+                    raise HTTPException(status_code=404, detail="Activity not found")
+                # Snapshot participants so later actions don't change this result
+                activity = activities[action.activity]
+                result = {**activity, "participants": sorted(activity["participants"])}
+            elif action.email is None:
+                raise HTTPException(status_code=422, detail="Email is required")
+            elif action.op == "signup":
+                result = signup_for_activity(action.activity, action.email)
+            else:
+                result = remove_participant_from_activity(action.activity, action.email)
+        except HTTPException as exc:
+            results.append({"status": exc.status_code, "detail": exc.detail})
+        else:
+            results.append({"status": 200, "result": result})
+    return {"results": results}
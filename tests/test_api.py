@@ -2,87 +2,108 @@
 Tests for the Mergington High School Activities API
 """
 
+import asyncio
+import copy
+from urllib.parse import quote
+
 import pytest
 from fastapi.testclient import TestClient
+from httpx import ASGITransport, AsyncClient
 from src.app import app, activities
 
+# Canonical activities state restored before each test
+_ORIGINAL_ACTIVITIES = {
+    "Chess Club": {
+        "description": "Learn strategies and compete in chess tournaments",
+        "schedule": "Fridays, 3:30 PM - 5:00 PM",
+        "max_participants": 12,
+        "participants": {"michael@mergington.edu", "daniel@mergington.edu"}
+    },
+    "Programming Class": {
+        "description": "Learn programming fundamentals and build software projects",
+        "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": {"emma@mergington.edu", "sophia@mergington.edu"}
+    },
+    "Gym Class": {
+        "description": "Physical education and sports activities",
+        "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
+        "max_participants": 30,
+        "participants": {"john@mergington.edu", "olivia@mergington.edu"}
+    },
+    "Soccer Team": {
+        "description": "Competitive soccer team training and matches",
+        "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
+        "max_participants": 18,
+        "participants": {"liam@mergington.edu", "noah@mergington.edu"}
+    },
+    "Basketball Club": {
+        "description": "Pickup games, drills, and interschool competitions",
+        "schedule": "Tuesdays and Thursdays, 4:30 PM - 6:00 PM",
+        "max_participants": 15,
+        "participants": {"ava@mergington.edu", "mason@mergington.edu"}
+    },
+    "Art Club": {
+        "description": "Explore drawing, painting, and mixed media projects",
+        "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
+        "max_participants": 20,
+        "participants": {"isabella@mergington.edu", "charlotte@mergington.edu"}
+    },
+    "Drama Club": {
+        "description": "Acting workshops, rehearsals, and stage productions",
+        "schedule": "Fridays, 4:00 PM - 6:30 PM",
+        "max_participants": 25,
+        "participants": {"ethan@mergington.edu", "mia@mergington.edu"}
+    },
+    "Math Club": {
+        "description": "Problem solving, competitions, and math enrichment",
+        "schedule": "Thursdays, 3:30 PM - 4:30 PM",
+        "max_participants": 20,
+        "participants": {"oliver@mergington.edu", "sophia.b@mergington.edu"}
+    },
+    "Debate Team": {
+        "description": "Public speaking, argumentation practice, and tournaments",
+        "schedule": "Tuesdays, 5:00 PM - 6:30 PM",
+        "max_participants": 16,
+        "participants": {"lucas@mergington.edu", "grace@mergington.edu"}
+    }
+}
 
-@pytest.fixture
+# URL-encoded path segment for each activity name used in tests
+_PATH = {name: quote(name) for name in [*_ORIGINAL_ACTIVITIES, "NonExistent Club"]}
+
+
+@pytest.fixture(scope="session")
 def client():
-    """Create a test client for the FastAPI app"""
+    """Create a test client for the FastAPI app, shared across the session"""
     return TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def anyio_backend():
+    """Run async tests on asyncio only"""
+    return "asyncio"
+
+
+@pytest.fixture
+async def async_client():
+    """Create an async client for tests that issue independent requests"""
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        yield ac
+
+
+@pytest.fixture
+def activities_response(client):
+    """Fetch GET /activities once for read-only tests"""
+    return client.get("/activities")
+
+
 @pytest.fixture(autouse=True)
 def reset_activities():
     """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        },
-        "Soccer Team": {
-            "description": "Competitive soccer team training and matches",
-            "schedule": "Mondays, Wednesdays, 4:00 PM - 6:00 PM",
-            "max_participants": 18,
-            "participants": ["liam@mergington.edu", "noah@mergington.edu"]
-        },
-        "Basketball Club": {
-            "description": "Pickup games, drills, and interschool competitions",
-            "schedule": "Tuesdays and Thursdays, 4:30 PM - 6:00 PM",
-            "max_participants": 15,
-            "participants": ["ava@mergington.edu", "mason@mergington.edu"]
-        },
-        "Art Club": {
-            "description": "Explore drawing, painting, and mixed media projects",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 20,
-            "participants": ["isabella@mergington.edu", "charlotte@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Acting workshops, rehearsals, and stage productions",
-            "schedule": "Fridays, 4:00 PM - 6:30 PM",
-            "max_participants": 25,
-            "participants": ["ethan@mergington.edu", "mia@mergington.edu"]
-        },
-        "Math Club": {
-            "description": "Problem solving, competitions, and math enrichment",
-            "schedule": "Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["oliver@mergington.edu", "sophia.b@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Public speaking, argumentation practice, and tournaments",
-            "schedule": "Tuesdays, 5:00 PM - 6:30 PM",
-            "max_participants": 16,
-            "participants": ["lucas@mergington.edu", "grace@mergington.edu"]
-        }
-    }
-    
-    # Clear and reset activities
-    activities.clear()
-    activities.update(original_activities)
-    
-    yield
-    
-    # Clean up after test (reset again)
     activities.clear()
-    activities.update(original_activities)
+    activities.update(copy.deepcopy(_ORIGINAL_ACTIVITIES))
 
 
 class TestRootEndpoint:
@@ -98,21 +119,19 @@ class TestRootEndpoint:
 class TestGetActivities:
     """Tests for GET /activities endpoint"""
     
-    def test_get_activities_success(self, client):
+    def test_get_activities_success(self, activities_response):
         """Test successfully retrieving all activities"""
-        response = client.get("/activities")
-        assert response.status_code == 200
+        assert activities_response.status_code == 200
         
-        data = response.json()
+        data = activities_response.json()
         assert isinstance(data, dict)
         assert len(data) == 9  # Should have 9 activities
         assert "Chess Club" in data
         assert "Programming Class" in data
     
-    def test_get_activities_structure(self, client):
+    def test_get_activities_structure(self, activities_response):
         """Test that activities have correct structure"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_response.json()
         
         # Check Chess Club structure
         chess_club = data["Chess Club"]
@@ -121,11 +140,11 @@ class TestGetActivities:
         assert "max_participants" in chess_club
         assert "participants" in chess_club
         assert isinstance(chess_club["participants"], list)
+        assert chess_club["participants"] == sorted(chess_club["participants"])
     
-    def test_get_activities_participants_count(self, client):
+    def test_get_activities_participants_count(self, activities_response):
         """Test that activities return correct participant counts"""
-        response = client.get("/activities")
-        data = response.json()
+        data = activities_response.json()
         
         assert len(data["Chess Club"]["participants"]) == 2
         assert len(data["Programming Class"]["participants"]) == 2
@@ -137,7 +156,7 @@ class TestSignupForActivity:
     def test_signup_success(self, client):
         """Test successful signup for an activity"""
         response = client.post(
-            "/activities/Chess%20Club/signup?email=newstudent@mergington.edu"
+            f"/activities/{_PATH['Chess Club']}/signup?email=newstudent@mergington.edu"
         )
         assert response.status_code == 200
         
@@ -147,47 +166,34 @@ class TestSignupForActivity:
         assert "Chess Club" in data["message"]
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Chess Club"]["participants"]
+        assert "newstudent@mergington.edu" in activities["Chess Club"]["participants"]
     
-    def test_signup_activity_not_found(self, client):
-        """Test signup for non-existent activity"""
-        response = client.post(
-            "/activities/NonExistent%20Club/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
+    @pytest.mark.parametrize("activity,email,expected_status,expected_detail", [
+        ("NonExistent Club", "student@mergington.edu", 404, "Activity not found"),
+        ("Chess Club", "michael@mergington.edu", 400, "already signed up"),
+    ], ids=["activity_not_found", "duplicate_participant"])
+    def test_signup_errors(self, client, activity, email, expected_status, expected_detail):
+        """Test that invalid signups are rejected with the right status and detail"""
+        response = client.post(f"/activities/{_PATH[activity]}/signup?email={email}")
+        assert response.status_code == expected_status
         
         data = response.json()
         assert "detail" in data
-        assert "Activity not found" in data["detail"]
-    
-    def test_signup_duplicate_participant(self, client):
-        """Test that duplicate signup is rejected"""
-        # First signup should succeed
-        response1 = client.post(
-            "/activities/Chess%20Club/signup?email=michael@mergington.edu"
-        )
-        assert response1.status_code == 400
-        
-        data = response1.json()
-        assert "already signed up" in data["detail"]
+        assert expected_detail in data["detail"]
     
     def test_signup_with_special_characters(self, client):
         """Test signup with email containing special characters"""
         email = "test.student+1@mergington.edu"
-        # Properly encode the + character as %2B for URL
-        encoded_email = email.replace("+", "%2B")
+        # Percent-encode the email so + is sent as %2B
+        encoded_email = quote(email)
         
         response = client.post(
-            f"/activities/Programming%20Class/signup?email={encoded_email}"
+            f"/activities/{_PATH['Programming Class']}/signup?email={encoded_email}"
         )
         assert response.status_code == 200
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data["Programming Class"]["participants"]
+        assert email in activities["Programming Class"]["participants"]
 
 
 class TestRemoveParticipant:
@@ -196,7 +202,7 @@ class TestRemoveParticipant:
     def test_remove_participant_success(self, client):
         """Test successfully removing a participant"""
         response = client.delete(
-            "/activities/Chess%20Club/participants?email=michael@mergington.edu"
+            f"/activities/{_PATH['Chess Club']}/participants?email=michael@mergington.edu"
         )
         assert response.status_code == 200
         
@@ -206,48 +212,65 @@ class TestRemoveParticipant:
         assert "michael@mergington.edu" in data["message"]
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "michael@mergington.edu" not in activities_data["Chess Club"]["participants"]
-    
-    def test_remove_participant_activity_not_found(self, client):
-        """Test removing participant from non-existent activity"""
-        response = client.delete(
-            "/activities/NonExistent%20Club/participants?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        
-        data = response.json()
-        assert "Activity not found" in data["detail"]
+        assert "michael@mergington.edu" not in activities["Chess Club"]["participants"]
     
-    def test_remove_participant_not_enrolled(self, client):
-        """Test removing participant who is not enrolled"""
-        response = client.delete(
-            "/activities/Chess%20Club/participants?email=notaparticipant@mergington.edu"
-        )
-        assert response.status_code == 404
+    @pytest.mark.parametrize("activity,email,expected_status,expected_detail", [
+        ("NonExistent Club", "student@mergington.edu", 404, "Activity not found"),
+        ("Chess Club", "notaparticipant@mergington.edu", 404, "Participant not found"),
+    ], ids=["activity_not_found", "not_enrolled"])
+    def test_remove_participant_errors(self, client, activity, email, expected_status, expected_detail):
+        """Test that invalid removals are rejected with the right status and detail"""
+        response = client.delete(f"/activities/{_PATH[activity]}/participants?email={email}")
+        assert response.status_code == expected_status
         
         data = response.json()
-        assert "Participant not found" in data["detail"]
+        assert expected_detail in data["detail"]
     
     def test_remove_participant_reduces_count(self, client):
         """Test that removing participant reduces the count"""
         # Get initial count
-        activities_response = client.get("/activities")
-        initial_count = len(activities_response.json()["Drama Club"]["participants"])
+        initial_count = len(activities["Drama Club"]["participants"])
         
         # Remove a participant
         response = client.delete(
-            "/activities/Drama%20Club/participants?email=ethan@mergington.edu"
+            f"/activities/{_PATH['Drama Club']}/participants?email=ethan@mergington.edu"
         )
         assert response.status_code == 200
         
         # Verify count decreased
-        activities_response = client.get("/activities")
-        final_count = len(activities_response.json()["Drama Club"]["participants"])
+        final_count = len(activities["Drama Club"]["participants"])
         assert final_count == initial_count - 1
 
 
+class TestBatchActions:
+    """Tests for POST /activities/batch endpoint"""
+    
+    def test_batch_reports_per_action_errors(self, client):
+        """Test that failing actions report their own status without aborting the batch"""
+        response = client.post("/activities/batch", json={"actions": [
+            {"op": "signup", "activity": "NonExistent Club", "email": "student@mergington.edu"},
+            {"op": "signup", "activity": "Chess Club", "email": "michael@mergington.edu"},
+            {"op": "remove", "activity": "Chess Club"},
+            {"op": "signup", "activity": "Chess Club", "email": "batch@mergington.edu"},
+            {"op": "get", "activity": "NonExistent Club"},
+        ]})
+        assert response.status_code == 200
+        
+        results = response.json()["results"]
+        assert [r["status"] for r in results] == [404, 400, 422, 200, 404]
+        assert "Activity not found" in results[0]["detail"]
+        assert "already signed up" in results[1]["detail"]
+        assert results[4] == {"status": 404, "detail": "Activity not found"}
+        assert "batch@mergington.edu" in activities["Chess Club"]["participants"]
+    
+    def test_batch_rejects_unknown_op(self, client):
+        """Test that an unsupported op fails request validation"""
+        response = client.post("/activities/batch", json={"actions": [
+            {"op": "rename", "activity": "Chess Club"},
+        ]})
+        assert response.status_code == 422
+
+
 class TestIntegrationScenarios:
     """Integration tests for common user workflows"""
     
@@ -256,44 +279,34 @@ class TestIntegrationScenarios:
         email = "workflow@mergington.edu"
         activity = "Math Club"
         
-        # Sign up
-        signup_response = client.post(
-            f"/activities/{activity.replace(' ', '%20')}/signup?email={email}"
-        )
-        assert signup_response.status_code == 200
-        
-        # Verify signup
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()[activity]["participants"]
-        
-        # Remove
-        remove_response = client.delete(
-            f"/activities/{activity.replace(' ', '%20')}/participants?email={email}"
-        )
-        assert remove_response.status_code == 200
+        response = client.post("/activities/batch", json={"actions": [
+            {"op": "signup", "activity": activity, "email": email},
+            {"op": "get", "activity": activity},
+            {"op": "remove", "activity": activity, "email": email},
+            {"op": "get", "activity": activity},
+        ]})
+        assert response.status_code == 200
         
-        # Verify removal
-        activities_response = client.get("/activities")
-        assert email not in activities_response.json()[activity]["participants"]
+        signup, after_signup, remove, after_remove = response.json()["results"]
+        assert signup["status"] == 200
+        assert email in after_signup["result"]["participants"]
+        assert remove["status"] == 200
+        assert remove["result"]["message"] == f"Removed {email} from {activity}"
+        assert email not in after_remove["result"]["participants"]
     
-    def test_multiple_signups_different_activities(self, client):
+    @pytest.mark.anyio
+    async def test_multiple_signups_different_activities(self, async_client):
         """Test that a student can sign up for multiple activities"""
         email = "multisport@mergington.edu"
         
-        # Sign up for Soccer Team
-        response1 = client.post(
-            f"/activities/Soccer%20Team/signup?email={email}"
+        # Sign up for Soccer Team and Basketball Club concurrently
+        response1, response2 = await asyncio.gather(
+            async_client.post(f"/activities/{_PATH['Soccer Team']}/signup?email={email}"),
+            async_client.post(f"/activities/{_PATH['Basketball Club']}/signup?email={email}"),
         )
         assert response1.status_code == 200
-        
-        # Sign up for Basketball Club
-        response2 = client.post(
-            f"/activities/Basketball%20Club/signup?email={email}"
-        )
         assert response2.status_code == 200
         
         # Verify both signups
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert email in activities_data["Soccer Team"]["participants"]
-        assert email in activities_data["Basketball Club"]["participants"]
+        assert email in activities["Soccer Team"]["participants"]
+        assert email in activities["Basketball Club"]["participants"]